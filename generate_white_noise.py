@@ -2,14 +2,205 @@
 # Read in the frequency response data, and generate synthetic data having that spectrum
 ##########################################################################################
 
+from functools import lru_cache
 import numpy as np
-from scipy.interpolate import interp1d
-from scipy.fftpack import ifft 
 from scipy.io.wavfile import write
-import os
-import sys
 
-def get_signal(freqs, responses, nyquist, sampling_rate, duration=10, lb_type='linear', ub_type='linear', eps=0.001):
+try:
+	from scipy.fft import irfft
+except ImportError: # scipy < 1.4 has no scipy.fft, so fall back to a full complex ifft from the legacy scipy.fftpack
+	from scipy.fftpack import ifft
+
+	def irfft(x, n, axis=-1, overwrite_x=False, workers=None):
+		'''
+		Minimal stand-in for scipy.fft.irfft (even 'n' only), which builds the mirrored negative frequencies explicitly.
+		The spectrum and its flipped conjugate are written into a single preallocated buffer, rather than concatenating temporaries.
+		'''
+
+		x = np.moveaxis(x, axis, -1)
+		m = n//2 + 1
+		buf = np.empty(x.shape[:-1] + (n,), dtype=x.dtype)
+		buf[..., :m] = x[..., :m]
+		np.conjugate(x[..., m-2:0:-1], out=buf[..., m:]) # remove extremal (0 and nyquist) amplitudes, then flip and conjugate
+		return np.moveaxis(np.real(ifft(buf, axis=-1, overwrite_x=True)), -1, axis)
+
+_BOUNDARY_CODES = {'zero': 0, 'flat': 1, 'linear': 2} # integer codes for 'lb_type' and 'ub_type'
+
+def _append_boundary(freqs_extended, responses_extended, n, code, edge_freq, edge_response, boundary, eps):
+	'''
+	Writes the values between the extremal frequency 'edge_freq' and 'boundary' (0 or nyquist) into the arrays starting at index 'n', according to 'code' (see _BOUNDARY_CODES).
+	The same logic serves both boundaries, 'eps' carries the sign of the step from 'edge_freq' towards 'boundary'.
+
+	Outputs:
+	'n'				- the number of values in the arrays after appending, or -1 if 'code' is not a valid boundary code
+	'''
+
+	if code == 1: # flat
+		freqs_extended[n] = boundary
+		responses_extended[n] = edge_response
+		return n+1
+	elif code == 2: # linear
+		freqs_extended[n] = boundary
+		responses_extended[n] = 0
+		return n+1
+	elif code == 0: # zero
+		freqs_extended[n] = edge_freq+eps
+		freqs_extended[n+1] = boundary
+		responses_extended[n:n+2] = 0
+		return n+2
+	else:
+		return -1
+
+
+def _extend_boundaries(freqs, responses, nyquist, lb_code, ub_code, eps):
+	'''
+	Adds additional values at the boundaries for 0 and nyquist if not already included, according to 'lb_code' and 'ub_code' (see _BOUNDARY_CODES).
+
+	Outputs:
+	'freqs_extended'		- float64 array of frequencies including the boundary values, sorted in increasing order (as required by np.interp)
+	'responses_extended'	- float64 array of responses corresponding to the frequency values in 'freqs_extended'
+	'''
+
+	n = len(freqs)
+	freqs_extended = np.empty(n+4) # at most two extra values are added at each boundary
+	responses_extended = np.empty(n+4)
+	freqs_extended[:n] = freqs
+	responses_extended[:n] = responses
+
+	min_freq_idx = np.argmin(freqs) # don't want to search the array multiple times
+	min_freq = freqs[min_freq_idx]  # don't want to search the array multiple times
+	if min_freq < 0:
+		raise Exception('\nfrequencies must be nonnegative\n')
+	elif min_freq > 0:
+		n = _append_boundary(freqs_extended, responses_extended, n, lb_code, min_freq, responses[min_freq_idx], 0.0, -eps)
+		if n < 0:
+			raise Exception("lb_type must be one of: 'zero', 'flat', 'linear'")
+
+	max_freq_idx = np.argmax(freqs) # the lower boundary values are never the maximum, so freqs can be searched instead
+	max_freq = freqs[max_freq_idx]
+	if max_freq > nyquist:
+		raise Exception('\nfrequencies cannot be greater than nyquist\n')
+	elif max_freq < nyquist:
+		n = _append_boundary(freqs_extended, responses_extended, n, ub_code, max_freq, responses[max_freq_idx], nyquist, eps)
+		if n < 0:
+			raise Exception("ub_type must be one of: 'zero', 'flat', 'linear'")
+
+	order = np.argsort(freqs_extended[:n])
+	return freqs_extended[:n][order], responses_extended[:n][order]
+
+
+@lru_cache(maxsize=None)
+def _next_smooth(n):
+	'''
+	Returns the smallest even integer >= n whose prime factors are all <= 5.
+	pocketfft is fastest on such lengths, while lengths with large prime factors fall back to the much slower Bluestein algorithm.
+	'''
+
+	m = n + (n % 2)
+	while True:
+		k = m
+		for p in (2, 3, 5):
+			while k % p == 0:
+				k //= p
+		if k == 1:
+			return m
+		m += 2
+
+
+@lru_cache(maxsize=32) # bounded, since every distinct grid holds a full float32 array
+def _frequency_grid(nyquist, n_samples):
+	'''
+	Returns n_samples evenly spaced float32 frequencies between 0 and nyquist.
+	The grid is shared between all spectra of the same size, so the returned array is read-only.
+	'''
+
+	x_f = np.linspace(0,nyquist,n_samples,dtype=np.float32)
+	x_f.setflags(write=False)
+
+	return x_f
+
+
+@lru_cache(maxsize=32) # bounded, since every distinct spectrum holds a full float32 array
+def _compute_spectrum(freqs, responses, nyquist, n_samples, lb_type, ub_type, eps):
+	'''
+	Computes the (deterministic) amplitude spectrum on the positive frequencies, see get_signal for a description of the inputs.
+	'freqs' and 'responses' must be passed as tuples so that the result can be cached, and the returned array is read-only since it is shared between calls.
+
+	Outputs:
+	'amplitudes'	- float32 array of 'n_samples' amplitudes, evenly spaced between 0 and nyquist
+	'''
+
+	# Interpolate the values in freqs according to 'lb_type' and 'ub_type'
+	freqs_extended, responses_extended = _extend_boundaries(np.asarray(freqs, dtype=np.float64), np.asarray(responses, dtype=np.float64),
+		float(nyquist), _BOUNDARY_CODES.get(lb_type, -1), _BOUNDARY_CODES.get(ub_type, -1), float(eps))
+
+	# Generate the full set of n_samples many interpolated values
+	# Everything is kept in float32/complex64, since the wav file is written as float32 anyway
+	x_f = _frequency_grid(nyquist, n_samples) # frequencies
+	y = np.interp(x_f, freqs_extended, responses_extended).astype(np.float32, copy=False) # amplitudes
+	y.setflags(write=False)
+
+	return y
+
+
+def _attach_random_phases(y, rngs):
+	'''
+	Multiplies the amplitudes 'y' by uniformly random unit phasors, returning a complex64 array of the same shape.
+	'rngs' holds one np.random.Generator per row of 'y' (a single one for 1-D 'y'), so that every row can be reproduced from its own seed.
+	The real and imaginary parts are written directly into the output (split-complex style), so that apart from the phases only a single scratch buffer is allocated.
+	'''
+
+	phase = np.empty(y.shape, dtype=np.float32) # associated (random) phases, drawn directly as float32
+	for row, rng in zip(phase.reshape(-1, y.shape[-1]), rngs):
+		rng.random(out=row, dtype=np.float32)
+	phase *= 2*np.pi
+	tmp = np.empty_like(phase)
+	signal_z = np.empty(y.shape, dtype=np.complex64)
+	np.multiply(y, np.cos(phase, out=tmp), out=signal_z.real)
+	np.multiply(y, np.sin(phase, out=phase), out=signal_z.imag) # the phases are no longer needed, so their buffer is reused
+
+	return signal_z
+
+
+def _lattice_phasors(n, delta, phi0):
+	'''
+	Computes exp(1j*(k*delta + phi0)) for k = 0, ..., n-1 using only O(log n) transcendental evaluations.
+	The table is built by repeated doubling: the first L values are multiplied by exp(1j*L*delta) to obtain the next L values, and L is then doubled.
+	Each round's factor is evaluated afresh in complex128, rather than by squaring the previous one, so that rounding errors don't compound across rounds.
+
+	Outputs:
+	'phasors'		- complex64 array of n unit-magnitude complex exponentials
+	'''
+
+	phasors = np.empty(n, dtype=np.complex64)
+	phasors[0] = np.exp(1j*phi0)
+	length = 1
+	while length < n:
+		block = min(length, n-length)
+		step = np.complex64(np.exp(1j*length*delta)) # exp(1j*L*delta) for the current block length L
+		np.multiply(phasors[:block], step, out=phasors[length:length+block])
+		length *= 2
+
+	return phasors
+
+
+def _attach_lattice_phases(y, rng, n_t):
+	'''
+	Multiplies the 1-D amplitudes 'y' by the lattice phasors exp(1j*(k*delta + phi0)), returning a complex64 array of the same shape.
+	A phase that is linear in k is a circular time shift, so the resulting signal is a single impulse response shifted by a random whole number of samples.
+	The shift is drawn from the first 'n_t' samples, so that the pulse survives trimming the (padded) transform back to 'n_t' samples.
+	'''
+
+	n_fft = 2*(len(y) - 1)
+	delta = -2*np.pi*rng.integers(n_t)/n_fft # spacing that moves the pulse to the drawn sample
+	phi0 = 2*np.pi*rng.random() # random offset
+	signal_z = _lattice_phasors(len(y), delta, phi0)
+	signal_z *= y
+
+	return signal_z
+
+
+def get_signal(freqs, responses, nyquist, sampling_rate, duration=10, lb_type='linear', ub_type='linear', eps=0.001, phase_mode='random', seed=None):
 	'''
 	Generates noise with a desired frequency distribution. Can be used for testing audio equipment.
 	The provided frequency response values are linearly interpolated between to obtain a continuous frequency response curve.
@@ -20,6 +211,12 @@ def get_signal(freqs, responses, nyquist, sampling_rate, duration=10, lb_type='l
 	2) 'flat'	- response value at the extremal end of freqs is repeated for all values outside of freqs
 	3) 'linear'	- response is linearly interpolated outside of freqs, decreasing to zero at the boundary
 
+	The phases attached to the spectrum are determined by the 'phase_mode' parameter.
+	The options for this parameter are:
+	1) 'random'	- every frequency gets an independent uniformly random phase
+	2) 'lattice'	- phases lie on the lattice k*delta + phi0, which is much cheaper to compute but does NOT produce noise:
+				  the output is one impulse response with the desired magnitude spectrum, circularly shifted to a random sample
+
 	Inputs:
 	'freqs' 		- array of frequencies, in Hz
 	'responses' 	- array of responses corresponding to the frequency values in 'freqs'
@@ -29,68 +226,101 @@ def get_signal(freqs, responses, nyquist, sampling_rate, duration=10, lb_type='l
 	'lb_type'		- how the frequency response should behave between 0 and min(freqs), one of 'zero', 'flat', or 'linear' (linear by default)
 	'ub_type'		- how the frequency response should behave between max(freqs) and nyquist, one of 'zero', 'flat', or 'linear' (linear by default)
 	'eps'			- the epsilon jump after which the response drops to zero in the 'zero' condition (defaults to 0.001Hz)
+	'phase_mode'	- how the phases of the frequency components are generated, one of 'random' or 'lattice' (random by default)
+	'seed'			- seed (or np.random.Generator) for the random phases, the same seed reproduces the same signal (unseeded by default, np.random.seed has no effect)
 
 	Outputs:
 	'times'			- array of times comprising the generated signal, in seconds
 	'amplitudes'	- array of amplitudes corresponding to the time values in 'times'
 	'''
 
-	# Interpolate the values in freqs according to 'lb_type' and 'ub_type'
-	# Add additional values at the boundaries for 0 and nyquist if not already included
-	freqs_extended = list(freqs)
-	responses_extended = list(responses)
+	# Look up the amplitudes, which only depend on the shape of the spectrum, then attach random phases and perform the ifft
+	# The transform is performed on a 5-smooth length n_fft >= sampling_rate*duration, and the signal is trimmed afterwards
+	n_t = int(sampling_rate*duration)
+	n_fft = _next_smooth(n_t)
+	n_samples = n_fft//2 + 1 # because: n_fft = n_samples + (n_samples - 2)
+	y = _compute_spectrum(tuple(freqs), tuple(responses), nyquist, n_samples, lb_type, ub_type, eps)
+	rng = np.random.default_rng(seed)
+	if phase_mode == 'random':
+		signal_z = _attach_random_phases(y, [rng]) # complex signal in z-space on positive frequencies
+	elif phase_mode == 'lattice':
+		signal_z = _attach_lattice_phases(y, rng, n_t) # complex signal in z-space on positive frequencies
+	else:
+		raise Exception("phase_mode must be one of: 'random', 'lattice'")
+	signal_t = irfft(signal_z, n=n_fft, overwrite_x=True, workers=-1)[:n_t] # real signal in t-space, negative frequencies are implied by hermitian symmetry
+	x_t = np.arange(0,duration,1.0/sampling_rate) # times
 
-	min_freq_idx = np.argmin(freqs_extended) # don't want to search the array multiple times
-	min_freq = freqs_extended[min_freq_idx]  # don't want to search the array multiple times
-	if min_freq < 0:
-		raise Exception('\nfrequencies must be nonnegative\n')
-	elif min_freq > 0:
-		if lb_type == 'flat':
-			freqs_extended.append(0)
-			responses_extended.append(responses_extended[min_freq_idx])
-		elif lb_type == 'linear':
-			freqs_extended.append(0)
-			responses_extended.append(0)
-		elif lb_type == 'zero':
-			freqs_extended.extend([min_freq-eps,0])
-			responses_extended.extend([0,0])
-		else:
-			raise Exception("lb_type must be one of: 'zero', 'flat', 'linear'")
+	return x_t, signal_t
 
-	max_freq_idx = np.argmax(freqs_extended) # don't want to search the array multiple times
-	max_freq = freqs_extended[max_freq_idx]  # don't want to search the array multiple times
-	if max_freq > nyquist:
-		raise Exception('\nfrequencies cannot be greater than nyquist\n')
-	elif max_freq < nyquist:
-		if ub_type == 'flat':
-			freqs_extended.append(nyquist)
-			responses_extended.append(responses_extended[max_freq_idx])
-		elif ub_type == 'linear':
-			freqs_extended.append(nyquist)
-			responses_extended.append(0)
-		elif ub_type == 'zero':
-			freqs_extended.extend([max_freq+eps,nyquist])
-			responses_extended.extend([0,0])
-		else:
-			raise Exception("ub_type must be one of: 'zero', 'flat', 'linear'")
 
-	# Compute the interpolation function
-	freq_func = interp1d(freqs_extended, responses_extended, 'linear')
-
-	# Generate the full set of sampling_rate*duration many interpolated values, and perform the ifft
-	n_samples = duration * nyquist + 1 # because: duration * sampling_rate = n_samples + (n_samples - 2)
-	x_f = np.linspace(0,nyquist,n_samples) # frequencies
-	y = freq_func(x_f) # amplitudes
-	phase = np.random.uniform(0, 2*np.pi, len(y)) # associated (random) phases
-	signal_z = y*np.exp(1j*phase) # complex signal in z-space on positive frequencies
-	signal_z = np.concatenate((signal_z,np.conjugate(signal_z[-2:0:-1]))) # remove extremal (0 and nyquist) amplitudes, then flip, conjugate, and concatenate
-	signal_t = np.real(ifft(signal_z)) # real signal in t-space
-	x_t = np.arange(0,duration,1.0/sampling_rate) # times
+def _max_freq(freqs):
+	'''
+	Returns the largest value in 'freqs', skipping the search for the common single-frequency case.
+	'''
 
-	return x_t, signal_t
+	return freqs[0] if len(freqs) == 1 else max(freqs)
+
+
+@lru_cache(maxsize=None, typed=True) # typed, so that e.g. nyquist=8000 and nyquist=8000.0 don't share a cached result
+def _resolve_rates(nyquist, sampling_rate, max_freq):
+	'''
+	Checks that 'nyquist' and 'sampling_rate' agree with each other and with the largest frequency 'max_freq', and fills in whichever one was not provided.
+	Only the maximum of freqs is passed in, so that the (repeated) checks can be cached.
+
+	Outputs:
+	'nyquist'		- the nyquist limit of the generated signal, in Hz
+	'sampling_rate'	- the sampling rate of the generated signal, in Hz, as an int (as required by the wav file header)
+	'''
+
+	# Check that 'nyquist' and 'sampling_rate' agree
+	if not nyquist and not sampling_rate:
+		raise Exception('\nEither nyquist or sampling_rate must be provided\n')
+	elif nyquist and sampling_rate:
+		if nyquist != sampling_rate/2.0:
+			raise Exception('\nnyquist must equal sampling_rate/2\n')
+	elif nyquist:
+		sampling_rate = 2*nyquist
+		if nyquist < max_freq:
+			raise Exception('\nfreqs may not contain values greater than nyquist\n')
+	elif sampling_rate:
+		nyquist = sampling_rate/2.0
+		if sampling_rate/2.0 < max_freq:
+			raise Exception('\nfreqs may not contain values greater than sampling_rate/2\n')
+
+	if sampling_rate != int(sampling_rate):
+		raise Exception('\nsampling_rate must be a whole number of Hz\n')
 
+	return nyquist, int(sampling_rate)
 
-def generate_white_noise(outfile_path, freqs, responses, nyquist=None, sampling_rate=None, duration=10, lb_type='linear', ub_type='linear', eps=0.001):
+
+def _check_options(phase_mode, output_dtype):
+	'''
+	Validates 'phase_mode' and 'output_dtype' up front, so that a bad value is reported before any signal is generated or any file is written.
+	'''
+
+	if phase_mode not in ('random', 'lattice'):
+		raise Exception("phase_mode must be one of: 'random', 'lattice'")
+	if output_dtype not in ('float32', 'int16'):
+		raise Exception("output_dtype must be one of: 'float32', 'int16'")
+
+
+def _rescale(signal, output_dtype):
+	'''
+	Rescales the float32 'signal' in place so that its max is 80% of the wav file limit, and converts it to 'output_dtype' ('float32' or 'int16').
+	'output_dtype' is assumed to have been validated by _check_options already.
+	'''
+
+	peak = max(signal.max(), -signal.min()) # peak magnitude from two reductions, without allocating abs(signal)
+	if output_dtype == 'int16':
+		signal *= 0.8*32767/peak # scale and clip in place, so that only the final cast allocates
+		np.clip(signal, -32768, 32767, out=signal)
+		return signal.astype(np.int16)
+	else:
+		signal *= 0.8/peak
+		return signal
+
+
+def generate_white_noise(outfile_path, freqs, responses, nyquist=None, sampling_rate=None, duration=10, lb_type='linear', ub_type='linear', eps=0.001, phase_mode='random', output_dtype='float32', seed=None):
 	'''
 	Generates noise with a desired frequency distribution. Can be used for testing audio equipment.
 	The provided frequency response values are linearly interpolated between to obtain a continuous frequency response curve.
@@ -101,6 +331,12 @@ def generate_white_noise(outfile_path, freqs, responses, nyquist=None, sampling_
 	2) 'flat'	- response value at the extremal end of freqs is repeated for all values outside of freqs
 	3) 'linear'	- response is linearly interpolated outside of freqs, decreasing to zero at the boundary
 
+	The phases attached to the spectrum are determined by the 'phase_mode' parameter.
+	The options for this parameter are:
+	1) 'random'	- every frequency gets an independent uniformly random phase
+	2) 'lattice'	- phases lie on the lattice k*delta + phi0, which is much cheaper to compute but does NOT produce noise:
+				  the output is one impulse response with the desired magnitude spectrum, circularly shifted to a random sample
+
 	Inputs:
 	'outfile_path'  - path where generated wav file should be saved
 	'freqs' 		- array of frequencies, in Hz
@@ -111,25 +347,79 @@ def generate_white_noise(outfile_path, freqs, responses, nyquist=None, sampling_
 	'lb_type'		- how the frequency response should behave between 0 and min(freqs), one of 'zero', 'flat', or 'linear' (linear by default)
 	'ub_type'		- how the frequency response should behave between max(freqs) and nyquist, one of 'zero', 'flat', or 'linear' (linear by default)
 	'eps'			- the epsilon jump after which the response drops to zero in the 'zero' condition (defaults to 0.001Hz)
+	'phase_mode'	- how the phases of the frequency components are generated, one of 'random' or 'lattice' (random by default)
+	'output_dtype'	- sample format of the wav file, either 'float32' (IEEE float) or 'int16' (PCM, half the file size) (float32 by default)
+	'seed'			- seed (or np.random.Generator) for the random phases, the same seed reproduces the same signal (unseeded by default, np.random.seed has no effect)
 
 	Outputs: None
 	'''
 
-	# Check that 'nyquist' and 'sampling_rate' agree
-	if not nyquist and not sampling_rate:
-		raise Exception('\nEither nyquist or sampling_rate must be provided\n')
-	elif nyquist and sampling_rate:
-		if nyquist != sampling_rate/2.0:
-			raise Exception('\nnyquist must equal sampling_rate/2\n')
-	elif nyquist:
-		sampling_rate = 2*nyquist
-		if nyquist < max(freqs):
-			raise Exception('\nfreqs may not contain values greater than nyquist\n')
-	elif sampling_rate:
-		nyquist = sampling_rate/2.0
-		if sampling_rate/2.0 < max(freqs):
-			raise Exception('\nfreqs may not contain values greater than sampling_rate/2\n')
+	_check_options(phase_mode, output_dtype)
+	nyquist, sampling_rate = _resolve_rates(nyquist, sampling_rate, _max_freq(freqs))
+	t, signal = get_signal(freqs, responses, nyquist, sampling_rate, duration, lb_type, ub_type, eps, phase_mode, seed)
+	write(outfile_path, sampling_rate, _rescale(signal, output_dtype))
+
+
+_REQUIRED_SPEC_KEYS = frozenset(['outfile_path', 'freqs', 'responses']) # keys of a generate_white_noise_batch spec
+_SPEC_KEYS = _REQUIRED_SPEC_KEYS | frozenset(['nyquist', 'sampling_rate', 'duration', 'lb_type', 'ub_type', 'eps', 'phase_mode', 'output_dtype', 'seed'])
+
+def generate_white_noise_batch(specs):
+	'''
+	Generates several noise files at once, see generate_white_noise for details.
+	The spectra are stacked and transformed with a single batched irfft, so all specs must share the same sampling rate and duration.
+
+	Inputs:
+	'specs'			- list of dicts, each holding the keyword arguments of a single generate_white_noise call ('outfile_path', 'freqs', 'responses', ...), unknown keys raise an Exception
+
+	Outputs: None
+	'''
+
+	outfile_paths = []
+	phase_modes = []
+	rngs = []
+	output_dtypes = []
+	spectra = []
+	shape = None
+	for spec in specs:
+		unknown_keys = set(spec) - _SPEC_KEYS
+		if unknown_keys:
+			raise Exception('\nunknown spec keys: %s\n' % ', '.join(sorted(unknown_keys)))
+		missing_keys = _REQUIRED_SPEC_KEYS - set(spec)
+		if missing_keys:
+			raise Exception('\nmissing spec keys: %s\n' % ', '.join(sorted(missing_keys)))
+		phase_mode = spec.get('phase_mode', 'random')
+		output_dtype = spec.get('output_dtype', 'float32')
+		_check_options(phase_mode, output_dtype)
+		freqs = spec['freqs']
+		nyquist, sampling_rate = _resolve_rates(spec.get('nyquist'), spec.get('sampling_rate'), _max_freq(freqs))
+		duration = spec.get('duration', 10)
+		if shape is None:
+			shape = (sampling_rate, duration)
+		elif shape != (sampling_rate, duration):
+			raise Exception('\nall specs in a batch must share the same sampling_rate and duration\n')
+		outfile_paths.append(spec['outfile_path'])
+		phase_modes.append(phase_mode)
+		rngs.append(np.random.default_rng(spec.get('seed'))) # one generator per spec, so that every file can be reproduced on its own
+		output_dtypes.append(output_dtype)
+		n_fft = _next_smooth(int(sampling_rate*duration))
+		spectra.append(_compute_spectrum(tuple(freqs), tuple(spec['responses']), nyquist, n_fft//2 + 1, spec.get('lb_type', 'linear'), spec.get('ub_type', 'linear'), spec.get('eps', 0.001)))
+	if not spectra:
+		return
+	sampling_rate, duration = shape
+
+	# Attach phases to every spectrum according to its 'phase_mode', and transform all of them along the last axis in one call
+	y = np.stack(spectra) # amplitudes, one row per spec
+	random_rows = [i for i, phase_mode in enumerate(phase_modes) if phase_mode == 'random']
+	if len(random_rows) == len(phase_modes):
+		signal_z = _attach_random_phases(y, rngs)
+	else:
+		signal_z = np.empty(y.shape, dtype=np.complex64)
+		if random_rows:
+			signal_z[random_rows] = _attach_random_phases(y[random_rows], [rngs[i] for i in random_rows])
+		for i, phase_mode in enumerate(phase_modes):
+			if phase_mode == 'lattice':
+				signal_z[i] = _attach_lattice_phases(y[i], rngs[i], int(sampling_rate*duration))
+	signals = irfft(signal_z, n=n_fft, axis=-1, overwrite_x=True, workers=-1)[:, :int(sampling_rate*duration)]
 
-	t, signal = get_signal(freqs, responses, nyquist, sampling_rate, duration, lb_type, ub_type, eps)
-	signal = np.array(0.8*signal/max(abs(signal)), dtype='float32') # rescale signal so that its max is 80% of wav file limit
-	write(outfile_path, sampling_rate, signal)
+	for outfile_path, output_dtype, signal in zip(outfile_paths, output_dtypes, signals):
+		write(outfile_path, sampling_rate, _rescale(signal, output_dtype)) # rescale each signal so that its max is 80% of wav file limit